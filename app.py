@@ -1,21 +1,84 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from dotenv import load_dotenv
 import os
 from pathlib import Path
 import google.generativeai as genai
 from youtube_transcript_api import YouTubeTranscriptApi
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import re
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import pandas as pd
 from collections import Counter
-import io
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import threading
+import logging
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
+MODEL_NAME = "models/gemma-3-27b-it"
+MODEL = genai.GenerativeModel(MODEL_NAME)
+
+# Context caching settings: the API rejects caches smaller than CACHE_MIN_TOKENS,
+# and token counts are estimated from characters to avoid an extra round-trip
+CACHE_MIN_TOKENS = 2048
+CACHE_TTL = timedelta(minutes=10)
+CHARS_PER_TOKEN = 4
+
+# Token budget for the transcript excerpt sent with keyword/sentiment prompts
+# when the full transcript is not cached
+PREFIX_MAX_TOKENS = 1000
+
+# Shown in place of keywords/sentiment when Gemini fails
+KEYWORDS_FALLBACK = "Unable to extract keywords"
+SENTIMENT_FALLBACK = "Unable to analyze sentiment"
+
+# Transcripts are persisted as UTF-8 text so reruns and restarts skip YouTube
+TRANSCRIPT_CACHE_DIR = Path(".cache") / "transcripts"
+
+# Precompiled patterns; the video ID pattern covers watch (v= in any position),
+# youtu.be and embed URLs in a single scan
+_VIDEO_ID_RE = re.compile(r'(?:youtube\.com/watch\?(?:.*&)?v=|youtu\.be/|youtube\.com/embed/)([^&\n?#]+)')
+_SAFE_ID_RE = re.compile(r'[\w-]+')
+_TITLE_RE = re.compile(r'<title>([^<]+)</title>')
+
+# Common words excluded from the transcript word-frequency analysis
+_STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'})
+
+# Shared HTTP session carrying the retry policy and pool limits for youtube.com.
+# Metadata lookups stop reading once the title arrives, which drops that
+# connection, so in practice most lookups open a fresh one
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    # Only connection failures are retried; a read timeout fails straight away so
+    # one lookup stays bounded (see HTTP_TIMEOUT)
+    max_retries=Retry(total=3, read=0, backoff_factor=0.2)
+))
+
+# Upper bound on concurrent Gemini requests across all worker threads
+GEMINI_SEMAPHORE = threading.Semaphore(4)
+BATCH_MAX_WORKERS = 8
+
+# (connect, read) timeouts for youtube.com requests, and how long a batch may go
+# without any URL finishing before the remaining URLs are abandoned. With only
+# connects retried, a metadata lookup is bounded at about 4 x 2s connect + 1.2s
+# backoff + 5s read ~= 14s, well inside the stall timeout
+HTTP_TIMEOUT = (2, 5)
+BATCH_STALL_TIMEOUT = 30
+
 # Different prompt templates for various summary types
 prompts = {
     "bullet_points": """You are a YouTube video summarizer. Create a concise bullet-point summary of the video transcript within 250 words. Focus on key points and main ideas.""",
@@ -28,61 +91,80 @@ prompts = {
 }
 
 # Enhanced functions for video analysis and processing
+# Network and LLM helpers are wrapped in st.cache_data so repeated analyses of the
+# same video (and Streamlit reruns) return instantly instead of re-querying. The
+# cached functions raise on failure and uncached wrappers supply the fallback, so
+# only successful results are cached and a retry after an error hits the network
 
 def extract_video_id(video_url):
     """Extract video ID from various YouTube URL formats"""
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-        r'youtube\.com\/watch\?.*v=([^&\n?#]+)'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, video_url)
-        if match:
-            return match.group(1)
-    return None
+    match = _VIDEO_ID_RE.search(video_url)
+    return match.group(1) if match else None
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_video_metadata(video_id):
+    """Scrape video metadata from the watch page; raises if the title is missing"""
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Accept-Encoding': 'gzip'
+    }
+    
+    # Stream the page and stop reading as soon as the <title> tag has arrived.
+    # Closing a partly read response discards its connection instead of returning
+    # it to the pool; draining the rest of a ~0.5 MB page to keep the socket would
+    # cost more than the TCP+TLS handshake it saves
+    title_match = None
+    buffer = ""
+    with SESSION.get(url, headers=headers, stream=True, timeout=HTTP_TIMEOUT) as response:
+        response.encoding = response.encoding or "utf-8"
+        for chunk in response.iter_content(chunk_size=4096, decode_unicode=True):
+            buffer += chunk
+            # Only rescan the new chunk plus enough overlap for a tag split across chunks
+            title_match = _TITLE_RE.search(buffer, max(0, len(buffer) - len(chunk) - 256))
+            if title_match:
+                break
+    
+    return {
+        'title': title_match.group(1).replace(' - YouTube', ''),
+        'video_id': video_id,
+        'url': url
+    }
+
+def fallback_metadata(video_id):
+    """Metadata shown when the watch page could not be scraped"""
+    return {
+        'title': "Unknown Title",
+        'video_id': video_id,
+        'url': f"https://www.youtube.com/watch?v={video_id}"
+    }
 
 def get_video_metadata(video_id):
     """Get video metadata using YouTube Data API (requires API key) or web scraping"""
     try:
         # Using web scraping as fallback (YouTube Data API requires additional setup)
-        url = f"https://www.youtube.com/watch?v={video_id}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        
-        # Extract title from HTML
-        title_match = re.search(r'<title>([^<]+)</title>', response.text)
-        title = title_match.group(1).replace(' - YouTube', '') if title_match else "Unknown Title"
-        
-        return {
-            'title': title,
-            'video_id': video_id,
-            'url': url
-        }
-    except Exception as e:
-        return {
-            'title': "Unknown Title",
-            'video_id': video_id,
-            'url': f"https://www.youtube.com/watch?v={video_id}"
-        }
+        return _fetch_video_metadata(video_id)
+    except (requests.RequestException, AttributeError) as e:
+        return fallback_metadata(video_id)
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def analyze_transcript(transcript_text):
     """Analyze transcript for various metrics"""
-    words = transcript_text.split()
+    words = transcript_text.lower().split()
     word_count = len(words)
     
+    # Extract most common words (excluding common stop words); counting every
+    # token runs in C, so filter the much smaller set of distinct words afterwards
+    word_freq = Counter(words)
+    for word in [word for word in word_freq if len(word) <= 3 or word in _STOP_WORDS]:
+        del word_freq[word]
+    top_words = word_freq.most_common(10)
+    
     # Calculate speaking speed (words per minute) - assuming average video length
     # This is an approximation since we don't have exact duration
     estimated_duration = len(transcript_text) / 200  # Rough estimate
     speaking_speed = (word_count / estimated_duration) * 60 if estimated_duration > 0 else 0
     
-    # Extract most common words (excluding common stop words)
-    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'}
-    
-    word_freq = Counter([word.lower() for word in words if word.lower() not in stop_words and len(word) > 3])
-    top_words = word_freq.most_common(10)
-    
     return {
         'word_count': word_count,
         'character_count': len(transcript_text),
@@ -91,55 +173,243 @@ def analyze_transcript(transcript_text):
         'estimated_duration': round(estimated_duration, 2)
     }
 
-def extract_keywords(transcript_text):
+@st.cache_resource
+def context_cache_status():
+    """Process-wide record of whether MODEL_NAME supports context caching.
+
+    Context caching is only offered for Gemini models, so any other model (e.g.
+    Gemma) is ruled out up front. Not every Gemini name supports it either (some
+    require a fixed version), so a failed upload marks caching unsupported and
+    the cost is paid at most once per process.
+    """
+    return {'supported': MODEL_NAME.startswith("models/gemini-")}
+
+def get_cached_model(transcript_text, video_id):
+    """Upload the transcript once as cached content and return a model bound to it.
+
+    Returns None for transcripts below the caching minimum or when caching is
+    unavailable, in which case callers fall back to the shared MODEL and send
+    the transcript with every prompt.
+    """
+    status = context_cache_status()
+    if not status['supported'] or len(transcript_text) / CHARS_PER_TOKEN < CACHE_MIN_TOKENS:
+        return None
+
+    # Keep the bound model alongside its cache so it is constructed once per
+    # video; failures are recorded process-wide by context_cache_status
+    caches = st.session_state.setdefault("transcript_caches", {})
+    entry = caches.get(video_id)
+    if entry is None or entry[0].expire_time <= datetime.now(timezone.utc):
+        try:
+            cache = genai.caching.CachedContent.create(
+                model=MODEL_NAME,
+                display_name=f"transcript-{video_id}",
+                contents=[transcript_text],
+                ttl=CACHE_TTL
+            )
+        except Exception as e:
+            logger.warning("Context caching unavailable for %s, sending transcripts inline: %s", MODEL_NAME, e)
+            status['supported'] = False
+            return None
+        entry = (cache, genai.GenerativeModel.from_cached_content(cached_content=cache))
+        caches[video_id] = entry
+
+    return entry[1]
+
+def truncate_transcript(transcript_text, max_tokens=PREFIX_MAX_TOKENS):
+    """Trim the transcript to roughly max_tokens, ending on a word boundary"""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(transcript_text) <= max_chars:
+        return transcript_text
+    prefix = transcript_text[:max_chars]
+    return prefix.rsplit(' ', 1)[0] or prefix
+
+# use_cache is part of the cache key: answers computed from the whole cached
+# transcript and from the prefix alone must not share an entry
+@st.cache_data(ttl=3600, show_spinner=False)
+def _generate_keywords(transcript_prefix, use_cache, _cached_model=None):
+    """Ask Gemini for the key phrases and topics of a transcript"""
+    if use_cache:
+        model = _cached_model
+        prompt = "Extract the main topics and key phrases from the cached video transcript. Return them as a comma-separated list of the most important topics and keywords."
+    else:
+        model = MODEL
+        prompt = f"""Extract the main topics and key phrases from this video transcript. Return them as a comma-separated list of the most important topics and keywords: {transcript_prefix}"""
+    with GEMINI_SEMAPHORE:
+        response = model.generate_content(prompt)
+    return response.text.strip()
+
+def extract_keywords(transcript_prefix, cached_model=None):
     """Extract key phrases and topics using Gemini"""
     try:
-        model = genai.GenerativeModel("models/gemma-3-27b-it")
-        prompt = f"""Extract the main topics and key phrases from this video transcript. Return them as a comma-separated list of the most important topics and keywords: {transcript_text[:1000]}"""
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        return _generate_keywords(transcript_prefix, cached_model is not None, _cached_model=cached_model)
     except Exception as e:
-        return "Unable to extract keywords"
+        return KEYWORDS_FALLBACK
 
-def analyze_sentiment(transcript_text):
+@st.cache_data(ttl=3600, show_spinner=False)
+def _generate_sentiment(transcript_prefix, use_cache, _cached_model=None):
+    """Ask Gemini for the overall sentiment of a transcript"""
+    if use_cache:
+        model = _cached_model
+        prompt = "Analyze the sentiment of the cached video transcript. Determine if it's positive, negative, or neutral and provide a brief explanation."
+    else:
+        model = MODEL
+        prompt = f"""Analyze the sentiment of this video transcript. Determine if it's positive, negative, or neutral and provide a brief explanation: {transcript_prefix}"""
+    with GEMINI_SEMAPHORE:
+        response = model.generate_content(prompt)
+    return response.text.strip()
+
+def analyze_sentiment(transcript_prefix, cached_model=None):
     """Basic sentiment analysis using Gemini"""
     try:
-        model = genai.GenerativeModel("models/gemma-3-27b-it")
-        prompt = f"""Analyze the sentiment of this video transcript. Determine if it's positive, negative, or neutral and provide a brief explanation: {transcript_text[:1000]}"""
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        return _generate_sentiment(transcript_prefix, cached_model is not None, _cached_model=cached_model)
     except Exception as e:
-        return "Unable to analyze sentiment"
+        return SENTIMENT_FALLBACK
 
-def generate_gemini_content(transcript_text, prompt):
+@st.cache_data(ttl=3600, show_spinner=False)
+def generate_gemini_content(transcript_text, prompt, _cached_model=None):
     """Generate content using Gemini model"""
-    model = genai.GenerativeModel("models/gemma-3-27b-it")
-    response = model.generate_content(transcript_text + prompt)
+    with GEMINI_SEMAPHORE:
+        if _cached_model is not None:
+            response = _cached_model.generate_content(prompt)
+        else:
+            response = MODEL.generate_content(transcript_text + prompt)
     return response.text
 
+# Transcripts rarely change, so successful fetches are kept for a day; failures
+# raise out of this function and are never cached
+@st.cache_data(ttl=86400, max_entries=512, show_spinner=False)
+def _fetch_transcript(video_id):
+    """Fetch a transcript from YouTube, reusing the on-disk copy if present"""
+    # Only well-formed IDs are used as file names
+    cache_path = TRANSCRIPT_CACHE_DIR / f"{video_id}.txt" if _SAFE_ID_RE.fullmatch(video_id) else None
+    if cache_path and cache_path.exists():
+        return cache_path.read_text(encoding="utf-8")
+        
+    transcript = YouTubeTranscriptApi().fetch(video_id)
+    transcript_text = " ".join([snippet.text for snippet in transcript])
+    
+    if cache_path:
+        # Write to a temporary file first so concurrent readers never see a partial transcript
+        try:
+            TRANSCRIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_text(transcript_text, encoding="utf-8")
+            tmp_path.replace(cache_path)
+        except OSError:
+            pass
+    return transcript_text
+
 def extract_transcript(video_url):
     """Extract transcript from YouTube video"""
+    video_id = extract_video_id(video_url)
+    if not video_id:
+        st.error("Invalid YouTube URL format")
+        return None, None
+    
     try:
-        video_id = extract_video_id(video_url)
-        if not video_id:
-            st.error("Invalid YouTube URL format")
-            return None, None
-            
-        transcript = YouTubeTranscriptApi().fetch(video_id)
-        transcript_text = " ".join([snippet.text for snippet in transcript])
-        return transcript_text, video_id
+        return _fetch_transcript(video_id), video_id
     except Exception as e:
         st.error(f"Error extracting transcript: {e}")
         return None, None
 
-def export_to_text(content, filename):
-    """Export content to text file"""
-    return io.BytesIO(content.encode())
+def make_executor(max_workers):
+    """Create a thread pool whose workers can call the cached Streamlit helpers"""
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx())
+    )
 
-def export_to_json(data, filename):
-    """Export data to JSON file"""
-    json_str = json.dumps(data, indent=2)
-    return io.BytesIO(json_str.encode())
+def process_batch_url(url, summary_type):
+    """Fetch and summarize a single batch URL on a worker thread.
+
+    Returns (row, error). Errors are returned rather than shown so the caller can
+    report them from the script thread. The title defaults to the video ID and is
+    filled in by the caller when metadata is fetched.
+    """
+    video_id = extract_video_id(url)
+    if not video_id:
+        return None, "Invalid YouTube URL format"
+    try:
+        transcript_text = _fetch_transcript(video_id)
+    except Exception as e:
+        return None, f"Error extracting transcript: {e}"
+
+    summary = generate_gemini_content(transcript_text, prompts[summary_type])
+    return {
+        'url': url,
+        'video_id': video_id,
+        'title': video_id,
+        'summary': summary,
+        'word_count': len(transcript_text.split())
+    }, None
+
+def process_batch(urls, summary_type, fetch_titles, on_progress):
+    """Process batch URLs concurrently and return the successful rows in input order.
+
+    on_progress(completed, total) is called from the calling thread as each URL
+    finishes, so it may update Streamlit elements.
+    """
+    # Every step is I/O-bound, so fan the URLs out over a bounded pool; metadata
+    # lookups run as separate tasks alongside the transcript/summary work
+    results = [None] * len(urls)
+    metadata_futures = {}
+    executor = make_executor(max_workers=BATCH_MAX_WORKERS)
+    futures = {}
+    for i, url in enumerate(urls):
+        futures[executor.submit(process_batch_url, url, summary_type)] = i
+        video_id = extract_video_id(url)
+        if fetch_titles and video_id:
+            metadata_futures[i] = executor.submit(get_video_metadata, video_id)
+    
+    # Collect results as they finish; if nothing completes within the stall
+    # timeout, give up on the rest rather than blocking the whole batch. Metadata
+    # tasks are waited on too so they are not cancelled while still queued
+    pending = set(futures) | set(metadata_futures.values())
+    completed = 0
+    while pending:
+        done, pending = wait(pending, timeout=BATCH_STALL_TIMEOUT, return_when=FIRST_COMPLETED)
+        if not done:
+            skipped = sum(future in futures for future in pending)
+            if skipped:
+                st.warning(f"Skipped {skipped} video(s) that did not finish within {BATCH_STALL_TIMEOUT} seconds")
+            break
+        for future in done:
+            if future not in futures:
+                continue  # metadata lookups are joined per row below
+            i = futures[future]
+            try:
+                results[i], error = future.result()
+            except Exception as e:
+                error = e
+            if error:
+                st.warning(f"Error processing {urls[i]}: {error}")
+            completed += 1
+            on_progress(completed, len(urls))
+    
+    executor.shutdown(wait=False, cancel_futures=True)
+    
+    # Titles are only copied from lookups that finished cleanly before the loop
+    # ended; every other row keeps its video ID as the title
+    
+    for i, row in enumerate(results):
+        metadata_future = metadata_futures.get(i)
+        if (row and metadata_future and metadata_future.done()
+                and not metadata_future.cancelled() and metadata_future.exception() is None):
+            row['title'] = metadata_future.result()['title']
+    
+    return [row for row in results if row]
+
+def export_to_text(content):
+    """Export content as UTF-8 text bytes"""
+    return content.encode()
+
+def export_to_json(data):
+    """Export data as JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
 
 
 # Main Application Interface
@@ -171,107 +441,154 @@ with col2:
     st.markdown("<br>", unsafe_allow_html=True)  # Add spacing
     analyze_button = st.button("🔍 Analyze Video", type="primary")
 
+# Results are kept in session state per video so that widget interactions, which
+# rerun the whole script, redraw from memory instead of refetching
+results_by_video = st.session_state.setdefault("results", {})
+
 # Process single video
 if analyze_button and youtube_url:
-    with st.spinner("Processing video..."):
-        transcript_text, video_id = extract_transcript(youtube_url)
-        
-        if transcript_text and video_id:
-            # Get video metadata
-            metadata = get_video_metadata(video_id)
-            
-            # Display video thumbnail and basic info
-            col1, col2 = st.columns([1, 2])
-            with col1:
-                st.image(f"https://img.youtube.com/vi/{video_id}/0.jpg", use_column_width=True)
-            
-            with col2:
-                st.subheader(f"📺 {metadata['title']}")
-                st.write(f"**Video ID:** {video_id}")
-                st.write(f"**URL:** {metadata['url']}")
-            
-            st.markdown("---")
-            
-            # Generate summary
-            st.subheader("📝 Summary")
-            summary = generate_gemini_content(transcript_text, prompts[summary_type])
-            st.write(summary)
-            
-            # Show additional analysis if requested
-            if show_analysis:
-                st.markdown("---")
-                st.subheader("📊 Transcript Analysis")
-                analysis = analyze_transcript(transcript_text)
-                
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Word Count", analysis['word_count'])
-                with col2:
-                    st.metric("Character Count", analysis['character_count'])
-                with col3:
-                    st.metric("Speaking Speed (WPM)", analysis['speaking_speed'])
-                
-                # Top words visualization
-                if analysis['top_words']:
-                    st.write("**Most Frequent Words:**")
-                    words_df = pd.DataFrame(analysis['top_words'], columns=['Word', 'Count'])
-                    st.bar_chart(words_df.set_index('Word'))
-            
-            if show_keywords:
-                st.markdown("---")
-                st.subheader("🔑 Key Topics & Keywords")
-                keywords = extract_keywords(transcript_text)
-                st.write(keywords)
-            
-            if show_sentiment:
-                st.markdown("---")
-                st.subheader("😊 Sentiment Analysis")
-                sentiment = analyze_sentiment(transcript_text)
-                st.write(sentiment)
-            
-            # Export options
-            st.markdown("---")
-            st.subheader("💾 Export Options")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                if st.button("📄 Export Summary"):
-                    text_file = export_to_text(summary, f"summary_{video_id}.txt")
-                    st.download_button(
-                        label="Download Summary",
-                        data=text_file.getvalue(),
-                        file_name=f"summary_{video_id}.txt",
-                        mime="text/plain"
-                    )
+    video_id = extract_video_id(youtube_url)
+    if video_id not in results_by_video:
+        with st.spinner("Fetching transcript..."):
+            transcript_text, video_id = extract_transcript(youtube_url)
+            if transcript_text and video_id:
+                results_by_video[video_id] = {
+                    'transcript_text': transcript_text,
+                    'transcript_prefix': truncate_transcript(transcript_text),
+                    'analysis': analyze_transcript(transcript_text),
+                    'summaries': {}
+                }
+    st.session_state["active_video"] = video_id
+
+video_id = st.session_state.get("active_video")
+result = results_by_video.get(video_id)
+
+if result:
+    transcript_text = result['transcript_text']
+    transcript_prefix = result['transcript_prefix']
+    
+    # Only fetch what this run shows and has not been produced yet. Only
+    # successful results are stored, so a failed piece is retried on the next run
+    missing_metadata = 'metadata' not in result
+    missing_summary = summary_type not in result['summaries']
+    missing_keywords = show_keywords and 'keywords' not in result
+    missing_sentiment = show_sentiment and 'sentiment' not in result
+    
+    if missing_metadata or missing_summary or missing_keywords or missing_sentiment:
+        with st.spinner("Processing video..."):
+            needs_gemini = missing_summary or missing_keywords or missing_sentiment
+            cached_model = get_cached_model(transcript_text, video_id) if needs_gemini else None
+            use_cache = cached_model is not None
             
-            with col2:
-                if st.button("📋 Export Full Data"):
-                    full_data = {
-                        'metadata': metadata,
-                        'summary': summary,
-                        'analysis': analyze_transcript(transcript_text),
-                        'keywords': extract_keywords(transcript_text),
-                        'sentiment': analyze_sentiment(transcript_text),
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    json_file = export_to_json(full_data, f"analysis_{video_id}.json")
-                    st.download_button(
-                        label="Download Full Analysis",
-                        data=json_file.getvalue(),
-                        file_name=f"analysis_{video_id}.json",
-                        mime="application/json"
-                    )
+            # The lookups are independent, so issue them concurrently
+            with make_executor(max_workers=4) as executor:
+                metadata_future = executor.submit(_fetch_video_metadata, video_id) if missing_metadata else None
+                summary_future = executor.submit(generate_gemini_content, transcript_text, prompts[summary_type], cached_model) if missing_summary else None
+                keywords_future = executor.submit(_generate_keywords, transcript_prefix, use_cache, cached_model) if missing_keywords else None
+                sentiment_future = executor.submit(_generate_sentiment, transcript_prefix, use_cache, cached_model) if missing_sentiment else None
             
-            with col3:
-                if st.button("📝 Export Transcript"):
-                    transcript_file = export_to_text(transcript_text, f"transcript_{video_id}.txt")
-                    st.download_button(
-                        label="Download Transcript",
-                        data=transcript_file.getvalue(),
-                        file_name=f"transcript_{video_id}.txt",
-                        mime="text/plain"
-                    )
+            for key, future in (('metadata', metadata_future), ('keywords', keywords_future), ('sentiment', sentiment_future)):
+                if future and future.exception() is None:
+                    result[key] = future.result()
+            if summary_future:
+                if summary_future.exception() is None:
+                    result['summaries'][summary_type] = summary_future.result()
+                else:
+                    st.error(f"Error generating summary: {summary_future.exception()}")
+    
+    metadata = result['metadata'] if 'metadata' in result else fallback_metadata(video_id)
+    analysis = result['analysis']
+    summary = result['summaries'].get(summary_type)
+    
+    # Display video thumbnail and basic info
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.image(f"https://img.youtube.com/vi/{video_id}/0.jpg", use_column_width=True)
+    
+    with col2:
+        st.subheader(f"📺 {metadata['title']}")
+        st.write(f"**Video ID:** {video_id}")
+        st.write(f"**URL:** {metadata['url']}")
+    
+    st.markdown("---")
+    
+    # Generate summary
+    st.subheader("📝 Summary")
+    if summary:
+        st.write(summary)
+    
+    # Show additional analysis if requested
+    if show_analysis:
+        st.markdown("---")
+        st.subheader("📊 Transcript Analysis")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Word Count", analysis['word_count'])
+        with col2:
+            st.metric("Character Count", analysis['character_count'])
+        with col3:
+            st.metric("Speaking Speed (WPM)", analysis['speaking_speed'])
+        
+        # Top words visualization
+        if analysis['top_words']:
+            st.write("**Most Frequent Words:**")
+            st.bar_chart({'Count': dict(analysis['top_words'])})
+    
+    if show_keywords:
+        st.markdown("---")
+        st.subheader("🔑 Key Topics & Keywords")
+        st.write(result.get('keywords', KEYWORDS_FALLBACK))
+    
+    if show_sentiment:
+        st.markdown("---")
+        st.subheader("😊 Sentiment Analysis")
+        st.write(result.get('sentiment', SENTIMENT_FALLBACK))
+    
+    # Export options
+    st.markdown("---")
+    st.subheader("💾 Export Options")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if summary and st.button("📄 Export Summary"):
+            st.download_button(
+                label="Download Summary",
+                data=export_to_text(summary),
+                file_name=f"summary_{video_id}.txt",
+                mime="text/plain"
+            )
+    
+    with col2:
+        if st.button("📋 Export Full Data"):
+            # Keywords and sentiment are only fetched here if their sections were
+            # hidden or failed; the wrappers' fallbacks are exported but not stored
+            needs_gemini = 'keywords' not in result or 'sentiment' not in result
+            cached_model = get_cached_model(transcript_text, video_id) if needs_gemini else None
+            full_data = {
+                'metadata': metadata,
+                'summary': summary,
+                'analysis': analysis,
+                'keywords': result['keywords'] if 'keywords' in result else extract_keywords(transcript_prefix, cached_model),
+                'sentiment': result['sentiment'] if 'sentiment' in result else analyze_sentiment(transcript_prefix, cached_model),
+                'timestamp': datetime.now().isoformat()
+            }
+            st.download_button(
+                label="Download Full Analysis",
+                data=export_to_json(full_data),
+                file_name=f"analysis_{video_id}.json",
+                mime="application/json"
+            )
+    
+    with col3:
+        if st.button("📝 Export Transcript"):
+            st.download_button(
+                label="Download Transcript",
+                data=export_to_text(transcript_text),
+                file_name=f"transcript_{video_id}.txt",
+                mime="text/plain"
+            )
 
 # Batch processing section
 st.markdown("---")
@@ -282,50 +599,48 @@ batch_urls = st.text_area(
     placeholder="https://www.youtube.com/watch?v=...\nhttps://www.youtube.com/watch?v=...",
     height=100
 )
+fetch_titles = st.checkbox(
+    "Fetch video titles",
+    value=False,
+    help="Downloads each video's watch page to read its title"
+)
 
 if st.button("🚀 Process Batch") and batch_urls:
     urls = [url.strip() for url in batch_urls.split('\n') if url.strip()]
     
     if urls:
-        batch_results = []
-        
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        for i, url in enumerate(urls):
-            status_text.text(f"Processing video {i+1}/{len(urls)}")
-            
-            transcript_text, video_id = extract_transcript(url)
-            if transcript_text and video_id:
-                metadata = get_video_metadata(video_id)
-                summary = generate_gemini_content(transcript_text, prompts[summary_type])
-                
-                batch_results.append({
-                    'url': url,
-                    'video_id': video_id,
-                    'title': metadata['title'],
-                    'summary': summary,
-                    'word_count': len(transcript_text.split())
-                })
-            
-            progress_bar.progress((i + 1) / len(urls))
+        status_text.text(f"Processing {len(urls)} videos...")
         
-        status_text.text("Batch processing complete!")
+        def on_progress(completed, total):
+            status_text.text(f"Processed video {completed}/{total}")
+            progress_bar.progress(completed / total)
         
-        # Display batch results
-        if batch_results:
-            st.subheader("📊 Batch Results")
-            
-            # Create a summary table
-            results_df = pd.DataFrame(batch_results)
-            st.dataframe(results_df[['title', 'word_count']], use_container_width=True)
-            
-            # Export batch results
-            if st.button("📊 Export Batch Results"):
-                batch_json = export_to_json(batch_results, "batch_results.json")
-                st.download_button(
-                    label="Download Batch Results",
-                    data=batch_json.getvalue(),
-                    file_name="batch_results.json",
-                    mime="application/json"
-                )
+        batch_results = process_batch(urls, summary_type, fetch_titles, on_progress)
+        st.session_state["batch_results"] = batch_results
+        # Only the displayed columns go into the table; the full rows, summaries
+        # included, are kept for the JSON export
+        st.session_state["batch_table"] = pd.DataFrame(
+            [{'title': row['title'], 'word_count': row['word_count']} for row in batch_results]
+        )
+        
+        status_text.text("Batch processing complete!")
+
+# Display batch results from session state so the export button survives reruns
+batch_results = st.session_state.get("batch_results")
+if batch_results:
+    st.subheader("📊 Batch Results")
+    
+    # Create a summary table
+    st.dataframe(st.session_state["batch_table"], use_container_width=True)
+    
+    # Export batch results
+    if st.button("📊 Export Batch Results"):
+        st.download_button(
+            label="Download Batch Results",
+            data=export_to_json(batch_results),
+            file_name="batch_results.json",
+            mime="application/json"
+        )